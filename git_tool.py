@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import git
 import os
 from datetime import datetime
@@ -7,8 +7,32 @@ import re
 from tkcalendar import DateEntry
 import queue
 import json
+import csv
+import sys
+import argparse
+import tempfile
+import time
+import random
+import subprocess
+import threading
+import atexit
+import inspect
+import traceback
+import cProfile
+import pstats
+import socket
+import socketserver
+import secrets
+import hmac
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+EVENT_FIELDS = ['title', 'date', 'description', 'created_branch', 
+                'merged_branches', 'created_tag', 'notes']
 
 class GitEvent:
+    __slots__ = EVENT_FIELDS
+
     def __init__(self):
         self.title = ""
         self.date = ""
@@ -18,8 +42,1724 @@ class GitEvent:
         self.created_tag = ""
         self.notes = ""
 
+    def to_record(self):
+        """转换为按字段顺序排列的紧凑列表"""
+        return [getattr(self, field) for field in EVENT_FIELDS]
+
+    @classmethod
+    def from_record(cls, record, fields=EVENT_FIELDS):
+        """从紧凑列表构建事件，fields 为记录写入时的字段顺序"""
+        event = cls()
+        for field, value in zip(fields, record):
+            if field in EVENT_FIELDS:
+                setattr(event, field, value)
+        return event
+
+EVENTS_FILE = 'git_events.jsonl'
+LEGACY_EVENTS_FILE = 'git_events.json'
+EVENT_SCHEMA_VERSION = 2
+EVENT_STATS_FILE = 'git_event_stats.json'
+EVENT_DATE_FORMAT = '%Y年%m月%d日'
+
+def event_to_dict(event):
+    """将事件对象转换为字典"""
+    return {field: getattr(event, field) for field in EVENT_FIELDS}
+
+def event_from_dict(event_dict):
+    """从字典构建事件对象"""
+    event = GitEvent()
+    for field in EVENT_FIELDS:
+        setattr(event, field, event_dict[field])
+    return event
+
+def iter_events_file(path=LEGACY_EVENTS_FILE, chunk_size=65536):
+    """逐条读取旧版事件文件中的 JSON 数组，内存占用与文件大小无关"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        started = False
+        eof = False
+        while True:
+            buffer = buffer.lstrip()
+            if not started:
+                if buffer.startswith('['):
+                    buffer = buffer[1:]
+                    started = True
+                    continue
+            elif buffer.startswith(','):
+                buffer = buffer[1:]
+                continue
+            elif buffer.startswith(']'):
+                return
+            elif buffer:
+                # 对象可能被截断在块边界上，解析失败时继续读取
+                try:
+                    event_dict, end = decoder.raw_decode(buffer)
+                except ValueError:
+                    if eof:
+                        raise
+                else:
+                    yield event_dict
+                    buffer = buffer[end:]
+                    continue
+            if eof:
+                if started or buffer:
+                    raise ValueError(f"Unexpected end of event file: {path}")
+                return
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer += chunk
+
+class EventHistory:
+    """按需解码的事件历史：首行为元数据，其后每行是一条紧凑记录
+
+    打开时只读取元数据，需要数量或随机访问时才扫描行偏移，
+    只有在视图或导出真正读取时才解码记录。
+    """
+
+    def __init__(self, path=EVENTS_FILE, legacy_path=None):
+        self.path = path
+        self.fields = list(EVENT_FIELDS)
+        self.offsets = None
+        # 只有默认的历史文件才从旧版文件迁移，导入导出等其他路径不受影响
+        if legacy_path is None and path == EVENTS_FILE:
+            legacy_path = LEGACY_EVENTS_FILE
+        if not os.path.exists(path) and legacy_path and os.path.exists(legacy_path):
+            self.migrate(legacy_path)
+        self.read_header()
+
+    def read_header(self):
+        """读取文件首行的元数据"""
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline() or b'{}')
+        except FileNotFoundError:
+            return
+        schema = header.get('schema', 1)
+        if schema > EVENT_SCHEMA_VERSION:
+            raise ValueError(f"Event history schema {schema} is newer than supported "
+                             f"({EVENT_SCHEMA_VERSION})")
+        self.fields = header.get('fields', self.fields)
+
+    def write_header(self, f):
+        f.write(json.dumps({'schema': EVENT_SCHEMA_VERSION, 'fields': EVENT_FIELDS}).encode('utf-8') + b'\n')
+
+    def migrate(self, legacy_path):
+        """将旧版 JSON 数组格式的历史流式转换为当前格式"""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as f:
+            self.write_header(f)
+            for event_dict in iter_events_file(legacy_path):
+                f.write(self.encode(event_from_dict(event_dict)))
+        os.replace(temp_path, self.path)
+
+    def encode(self, event):
+        return json.dumps(event.to_record(), ensure_ascii=False).encode('utf-8') + b'\n'
+
+    def decode(self, line):
+        return GitEvent.from_record(json.loads(line), self.fields)
+
+    def file_size(self):
+        """返回历史文件大小，用于判断汇总表是否过期"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def build_index(self):
+        """扫描每条记录的起始偏移，不解码记录内容"""
+        if self.offsets is not None:
+            return
+        self.offsets = []
+        try:
+            with open(self.path, 'rb') as f:
+                offset = len(f.readline())
+                for line in f:
+                    if line.strip():
+                        self.offsets.append(offset)
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+
+    def __len__(self):
+        self.build_index()
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        self.build_index()
+        offset = self.offsets[index]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return self.decode(f.readline())
+
+    def __iter__(self):
+        """按顺序逐条解码事件"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.readline()
+                for line in f:
+                    if line.strip():
+                        yield self.decode(line)
+        except FileNotFoundError:
+            return
+
+    def iter_dicts(self):
+        """按顺序逐条返回事件字典"""
+        for event in self:
+            yield event_to_dict(event)
+
+    def append(self, event):
+        """将事件追加到文件末尾，无需重写已有记录"""
+        with open(self.path, 'ab') as f:
+            if f.tell() == 0:
+                self.write_header(f)
+                self.fields = list(EVENT_FIELDS)
+            elif self.fields != EVENT_FIELDS:
+                raise ValueError("Event history uses an older field layout; "
+                                 "rewrite it before appending")
+            offset = f.tell()
+            f.write(self.encode(event))
+        if self.offsets is not None:
+            self.offsets.append(offset)
+
+def parse_filter_date(value):
+    """解析过滤条件中的日期（YYYY-MM-DD 字符串或 date 对象）"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+def filter_events(event_dicts, since=None, until=None, prefix=None):
+    """按日期范围和分支/标签前缀过滤事件"""
+    since = parse_filter_date(since)
+    until = parse_filter_date(until)
+    for event_dict in event_dicts:
+        if since or until:
+            try:
+                event_date = datetime.strptime(event_dict['date'], EVENT_DATE_FORMAT).date()
+            except (TypeError, ValueError):
+                continue
+            if since and event_date < since:
+                continue
+            if until and event_date > until:
+                continue
+        if prefix and not (event_dict['created_branch'].startswith(prefix) or 
+                           event_dict['created_tag'].startswith(prefix)):
+            continue
+        yield event_dict
+
+def detect_event_format(path, fmt=None):
+    """根据参数或文件扩展名确定导入导出格式"""
+    if fmt:
+        return fmt
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+def write_events_jsonl(event_dicts, f):
+    """以 JSONL 格式逐条写出事件，返回写出的数量"""
+    count = 0
+    for event_dict in event_dicts:
+        f.write(json.dumps(event_dict, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+def write_events_csv(event_dicts, f):
+    """以 CSV 格式逐条写出事件，合并列表编码为 JSON 字符串，返回写出的数量"""
+    writer = csv.DictWriter(f, fieldnames=EVENT_FIELDS)
+    writer.writeheader()
+    count = 0
+    for event_dict in event_dicts:
+        row = dict(event_dict)
+        row['merged_branches'] = json.dumps(row['merged_branches'], ensure_ascii=False)
+        writer.writerow(row)
+        count += 1
+    return count
+
+def read_events_jsonl(f):
+    """逐行读取 JSONL 格式的事件"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def read_events_csv(f):
+    """逐行读取 CSV 格式的事件"""
+    for row in csv.DictReader(f):
+        event_dict = {field: row.get(field) or '' for field in EVENT_FIELDS}
+        # 引用名称中可能含有分号，合并列表以 JSON 字符串存放
+        merged = event_dict['merged_branches']
+        event_dict['merged_branches'] = json.loads(merged) if merged else []
+        yield event_dict
+
+def export_events(path, fmt=None, since=None, until=None, prefix=None, source=EVENTS_FILE):
+    """将事件历史流式导出为 JSONL 或 CSV，返回导出的数量"""
+    fmt = detect_event_format(path, fmt)
+    event_dicts = filter_events(EventHistory(source).iter_dicts(), since, until, prefix)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            return write_events_csv(event_dicts, f)
+        return write_events_jsonl(event_dicts, f)
+
+def import_events(path, fmt=None, target=EVENTS_FILE):
+    """将 JSONL 或 CSV 事件流式追加到事件历史，返回导入的数量"""
+    fmt = detect_event_format(path, fmt)
+    history = EventHistory(target)
+    original_size = history.file_size()
+    count = 0
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = read_events_csv(f) if fmt == 'csv' else read_events_jsonl(f)
+            for event_dict in reader:
+                history.append(event_from_dict(event_dict))
+                count += 1
+    except Exception:
+        # 导入失败时截断到原始长度，避免留下部分导入的记录
+        if original_size:
+            with open(target, 'r+b') as f:
+                f.truncate(original_size)
+        elif os.path.exists(target):
+            os.remove(target)
+        raise
+    return count
+
+class EventAnalytics:
+    """事件统计汇总表，保存事件时增量更新，打开统计面板时无需重新扫描历史"""
+
+    def __init__(self, path=EVENT_STATS_FILE):
+        self.path = path
+        self.reset()
+
+    def reset(self):
+        """清空所有汇总表"""
+        self.event_count = 0
+        self.branches_per_week = {}
+        self.merge_counts = {}
+        self.branch_first_seen = {}
+        self.branch_to_tag = {}
+
+    def record(self, event):
+        """将单个事件计入汇总表"""
+        self.event_count += 1
+        try:
+            event_date = datetime.strptime(event.date, EVENT_DATE_FORMAT).date()
+        except (TypeError, ValueError):
+            event_date = None
+        
+        # 每周新建分支数（同一分支只计一次）
+        if event.created_branch and event_date and event.created_branch not in self.branch_first_seen:
+            year, week, _ = event_date.isocalendar()
+            week_key = f"{year}-W{week:02d}"
+            self.branches_per_week[week_key] = self.branches_per_week.get(week_key, 0) + 1
+            self.branch_first_seen[event.created_branch] = event_date.isoformat()
+        
+        # 各分支被合并的次数
+        for branch in event.merged_branches:
+            self.merge_counts[branch] = self.merge_counts.get(branch, 0) + 1
+        
+        # 从创建分支到打标签的天数
+        if event.created_tag and event.created_branch and event_date:
+            first_seen = self.branch_first_seen.get(event.created_branch)
+            if first_seen:
+                days = (event_date - datetime.strptime(first_seen, '%Y-%m-%d').date()).days
+                self.branch_to_tag[event.created_tag] = {
+                    'branch': event.created_branch,
+                    'days': days
+                }
+
+    def rebuild(self, events):
+        """根据完整事件历史重建汇总表"""
+        self.reset()
+        for event in events:
+            self.record(event)
+
+    def load(self, history):
+        """加载汇总表，与事件历史文件大小不一致时重建"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.event_count = data['event_count']
+            self.branches_per_week = data['branches_per_week']
+            self.merge_counts = data['merge_counts']
+            self.branch_first_seen = data['branch_first_seen']
+            self.branch_to_tag = data['branch_to_tag']
+            source_size = data['source_size']
+        except (FileNotFoundError, ValueError, KeyError):
+            self.reset()
+            source_size = None
+        
+        # 只比较文件大小，不需要读取事件历史
+        if source_size != history.file_size():
+            self.rebuild(history)
+            self.save(history.file_size())
+
+    def save(self, source_size):
+        """将汇总表连同对应的事件文件大小保存到文件"""
+        data = {
+            'source_size': source_size,
+            'event_count': self.event_count,
+            'branches_per_week': self.branches_per_week,
+            'merge_counts': self.merge_counts,
+            'branch_first_seen': self.branch_first_seen,
+            'branch_to_tag': self.branch_to_tag
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def average_branch_to_tag_days(self):
+        """计算从创建分支到打标签的平均天数"""
+        if not self.branch_to_tag:
+            return None
+        total = sum(item['days'] for item in self.branch_to_tag.values())
+        return total / len(self.branch_to_tag)
+
+def build_base_name(prefix, custom, date):
+    """根据前缀、自定义后缀和日期构建基础名称"""
+    if prefix == 'custom':
+        return custom
+    base_name = f"{prefix}_{date}"
+    if custom:
+        base_name = f"{base_name}_{custom}"
+    return base_name
+
+def next_available_name(base_name, existing_names):
+    """如果名称已存在，添加下一个可用的数字后缀"""
+    existing_names = set(existing_names)
+    if base_name not in existing_names:
+        return base_name
+    
+    # 查找所有相似的名称，找出最大的编号
+    pattern = re.compile(f"^{re.escape(base_name)}(\\.\\d+)?$")
+    max_number = 0
+    for name in existing_names:
+        match = pattern.match(name)
+        if match and match.group(1):
+            max_number = max(max_number, int(match.group(1)[1:]))
+    
+    # 使用下一个编号
+    return f"{base_name}.{max_number + 1}"
+
+def list_branch_names(repo):
+    """获取所有本地和远程分支名称"""
+    all_branches = [branch.name for branch in repo.heads]
+    remote_branches = [ref.name.split('/')[-1] for ref in repo.remote().refs 
+                       if not ref.name.endswith('/HEAD')]
+    return list(set(all_branches + remote_branches))
+
+def list_tag_names(repo):
+    """获取所有标签名称"""
+    return [tag.name for tag in repo.tags]
+
+PLAN_TIMINGS_FILE = 'git_plan_timings.json'
+
+def load_release_plan(path):
+    """读取发布计划文件并补全默认值"""
+    with open(path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    
+    if not plan.get('base'):
+        raise ValueError("Release plan must specify a 'base' ref")
+    today = datetime.now().strftime('%Y.%m.%d')
+    plan.setdefault('remote', 'origin')
+    plan.setdefault('merge', [])
+    duplicates = sorted({item for item in plan['merge'] if plan['merge'].count(item) > 1})
+    if duplicates:
+        raise ValueError(f"Release plan lists merge items more than once: {', '.join(duplicates)}")
+    for section in ('branch', 'tag'):
+        if plan.get(section):
+            plan[section].setdefault('prefix', '')
+            plan[section].setdefault('suffix', '')
+            plan[section].setdefault('date', today)
+    if not plan.get('branch'):
+        raise ValueError("Release plan must specify a 'branch' naming section")
+    push = plan.get('push', {})
+    if isinstance(push, bool):
+        push = {'branch': push, 'tag': push}
+    plan['push'] = {'branch': push.get('branch', False), 'tag': push.get('tag', False)}
+    return plan
+
+def resolve_merge_rev(repo, name, remote_name='origin'):
+    """解析合并项目，只存在于远程的分支使用远程跟踪引用"""
+    pool = get_cat_file_pool(repo)
+    for rev in (name, f"{remote_name}/{name}"):
+        if pool.resolve(rev):
+            return rev
+    raise ValueError(f"Unknown merge item: {name}")
+
+class GitCatFilePool:
+    """为每个仓库保持常驻的 git cat-file --batch / --batch-check 进程，避免每次查询都启动新进程"""
+
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self.lock = threading.Lock()
+        self.processes = {}
+        self.counters = {}
+
+    def _process(self, mode):
+        """获取（必要时启动）指定模式的常驻进程"""
+        process = self.processes.get(mode)
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(['git', 'cat-file', f'--{mode}'], cwd=self.repo_path, 
+                                       stdin=subprocess.PIPE, stdout=subprocess.PIPE, 
+                                       stderr=subprocess.DEVNULL)
+            self.processes[mode] = process
+            self._counter(mode)['spawns'] += 1
+        return process
+
+    def _discard(self, mode):
+        """丢弃已失效的进程"""
+        process = self.processes.pop(mode, None)
+        if process is not None:
+            try:
+                process.kill()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+
+    def _counter(self, mode):
+        return self.counters.setdefault(mode, {'requests': 0, 'hits': 0, 'misses': 0, 
+                                               'spawns': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+
+    def _query(self, mode, rev):
+        """发送一次查询，返回 (sha, 类型, 大小, 内容) 或 None"""
+        if '\n' in rev:
+            raise ValueError(f"Invalid object name: {rev!r}")
+        start = time.perf_counter()
+        with self.lock:
+            for attempt in range(2):
+                process = self._process(mode)
+                try:
+                    process.stdin.write(rev.encode('utf-8') + b'\n')
+                    process.stdin.flush()
+                    line = process.stdout.readline()
+                    if not line:
+                        # 读到 EOF 说明进程已退出，不能当作对象不存在
+                        raise EOFError(f"git cat-file --{mode} exited unexpectedly")
+                    header = line.decode('utf-8').split()
+                    data = None
+                    if len(header) == 3 and mode == 'batch':
+                        data = process.stdout.read(int(header[2]))
+                        process.stdout.read(1)
+                    break
+                except (EOFError, OSError):
+                    # 进程异常退出：丢弃后重新启动并重试一次
+                    self._discard(mode)
+                    if attempt:
+                        raise
+            
+            elapsed = (time.perf_counter() - start) * 1000
+            counter = self._counter(mode)
+            counter['requests'] += 1
+            counter['total_ms'] += elapsed
+            counter['max_ms'] = max(counter['max_ms'], elapsed)
+            if len(header) != 3:
+                counter['misses'] += 1
+                return None
+            counter['hits'] += 1
+            return header[0], header[1], int(header[2]), data
+
+    def check(self, rev):
+        """查询对象元数据，返回 (sha, 类型, 大小)，对象不存在时返回 None"""
+        result = self._query('batch-check', rev)
+        return result[:3] if result else None
+
+    def read(self, rev):
+        """读取对象内容，返回 (sha, 类型, 内容)，对象不存在时返回 None"""
+        result = self._query('batch', rev)
+        return (result[0], result[1], result[3]) if result else None
+
+    def resolve(self, rev):
+        """将引用解析为提交 SHA，不存在时返回 None"""
+        result = self.check(f"{rev}^{{commit}}")
+        return result[0] if result else None
+
+    def stats(self):
+        """返回各模式的命中次数和延迟统计"""
+        stats = {}
+        for mode, counter in self.counters.items():
+            stats[mode] = dict(counter)
+            stats[mode]['avg_ms'] = counter['total_ms'] / counter['requests'] if counter['requests'] else 0.0
+        return stats
+
+    def close(self):
+        """关闭所有常驻进程"""
+        with self.lock:
+            for process in self.processes.values():
+                try:
+                    process.stdin.close()
+                    process.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    process.kill()
+            self.processes = {}
+
+_cat_file_pools = {}
+_cat_file_pools_lock = threading.Lock()
+
+def get_cat_file_pool(repo):
+    """获取仓库对应的常驻 cat-file 进程池"""
+    repo_path = os.path.abspath(repo.working_dir)
+    with _cat_file_pools_lock:
+        pool = _cat_file_pools.get(repo_path)
+        if pool is None:
+            pool = GitCatFilePool(repo_path)
+            _cat_file_pools[repo_path] = pool
+        return pool
+
+def close_cat_file_pools():
+    """关闭所有常驻 cat-file 进程"""
+    with _cat_file_pools_lock:
+        for pool in _cat_file_pools.values():
+            pool.close()
+        _cat_file_pools.clear()
+
+atexit.register(close_cat_file_pools)
+
+def format_cat_file_stats(stats):
+    """格式化 cat-file 进程池统计信息"""
+    lines = []
+    for mode, counter in sorted(stats.items()):
+        lines.append(f"{mode}: {counter['requests']} requests, {counter['hits']} hits, "
+                     f"{counter['misses']} misses, {counter['spawns']} processes, "
+                     f"avg {counter['avg_ms']:.2f} ms, max {counter['max_ms']:.2f} ms")
+    return "\n".join(lines) or "No object lookups yet"
+
+def run_git_with_input(repo, args, text):
+    """运行需要从标准输入读取数据的 git 命令，返回标准输出"""
+    result = subprocess.run(['git'] + list(args), cwd=repo.working_dir, input=text, 
+                            capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        raise git.GitCommandError(['git'] + list(args), result.returncode, 
+                                  result.stderr, result.stdout)
+    return result.stdout
+
+def analyze_merge_candidates(repo, items, remote_name='origin'):
+    """分析合并候选项相对合并基点的变更文件，items 为 (类型, 名称) 列表"""
+    candidates = []
+    for kind, name in items:
+        candidates.append({'kind': kind, 'name': name, 
+                           'rev': resolve_merge_rev(repo, name, remote_name)})
+    if not candidates:
+        return candidates
+    
+    # 通过常驻 cat-file 进程解析 HEAD 和所有候选项的提交
+    pool = get_cat_file_pool(repo)
+    head_sha = pool.resolve('HEAD')
+    for candidate in candidates:
+        candidate['sha'] = pool.resolve(candidate['rev'])
+    
+    # 并发计算各候选项的合并基点
+    def merge_base(candidate):
+        try:
+            return repo.git.merge_base(head_sha, candidate['sha'])
+        except git.GitCommandError:
+            return None
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as pool:
+        bases = list(pool.map(merge_base, candidates))
+    for candidate, base in zip(candidates, bases):
+        candidate['base'] = base
+        candidate['merged'] = base == candidate['sha']
+        candidate['fast_forward'] = base == head_sha and not candidate['merged']
+        candidate['files'] = set()
+    
+    # 通过一次 diff-tree --stdin 批量获取变更文件
+    pairs = {c['sha']: c['base'] for c in candidates if c['base'] and not c['merged']}
+    if pairs:
+        stdin = ''.join(f"{sha} {base}\n" for sha, base in pairs.items())
+        output = run_git_with_input(repo, ['-c', 'core.quotepath=off', 'diff-tree', '-r', 
+                                           '--name-only', '--always', '--format=@@%H', 
+                                           '--stdin'], stdin)
+        files_by_sha = {}
+        current = None
+        for line in output.splitlines():
+            if line.startswith('@@'):
+                current = files_by_sha.setdefault(line[2:], set())
+            elif line and current is not None:
+                current.add(line)
+        for candidate in candidates:
+            candidate['files'] = files_by_sha.get(candidate['sha'], set())
+    return candidates
+
+def order_merge_candidates(candidates):
+    """先合并快进和互不重叠的变更，再将重叠的变更分组连续合并"""
+    pending = [c for c in candidates if not c['merged']]
+    
+    # 用并查集将变更文件有重叠的候选项归为一组
+    parent = list(range(len(pending)))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    owner = {}
+    for index, candidate in enumerate(pending):
+        for path in candidate['files']:
+            if path in owner:
+                parent[find(index)] = find(owner[path])
+            else:
+                owner[path] = index
+    
+    groups = {}
+    for index, candidate in enumerate(pending):
+        groups.setdefault(find(index), []).append(candidate)
+    
+    def group_key(group):
+        return (len(group) > 1, 
+                not any(c['fast_forward'] for c in group), 
+                sum(len(c['files']) for c in group))
+    
+    ordered = []
+    for group in sorted(groups.values(), key=group_key):
+        ordered.extend(sorted(group, key=lambda c: (not c['fast_forward'], len(c['files']))))
+    return ordered
+
+MAINTENANCE_THRESHOLDS = {
+    'loose_refs': 100,
+    'loose_objects': 1000,
+    'stale_remote_refs': 1
+}
+
+def inspect_repository(repo, remote_name='origin'):
+    """统计松散引用、松散对象、commit-graph 和过期的远程跟踪引用"""
+    git_dir = repo.git.rev_parse('--git-common-dir')
+    if not os.path.isabs(git_dir):
+        git_dir = os.path.join(repo.working_dir, git_dir)
+    
+    loose_refs = 0
+    for _, _, files in os.walk(os.path.join(git_dir, 'refs')):
+        loose_refs += len(files)
+    
+    counts = {}
+    for line in repo.git.count_objects('-v').splitlines():
+        key, _, value = line.partition(':')
+        counts[key.strip()] = value.strip()
+    
+    info_dir = os.path.join(git_dir, 'objects', 'info')
+    has_commit_graph = (os.path.exists(os.path.join(info_dir, 'commit-graph')) or 
+                        os.path.exists(os.path.join(info_dir, 'commit-graphs', 'commit-graph-chain')))
+    
+    stale_remote_refs = []
+    try:
+        for line in repo.git.remote('prune', '--dry-run', remote_name).splitlines():
+            if '[would prune]' in line:
+                stale_remote_refs.append(line.split(']', 1)[1].strip())
+    except git.GitCommandError:
+        pass
+    
+    return {
+        'loose_refs': loose_refs,
+        'loose_objects': int(counts.get('count', 0)),
+        'packs': int(counts.get('packs', 0)),
+        'commit_graph': has_commit_graph,
+        'stale_remote_refs': stale_remote_refs
+    }
+
+def benchmark_hot_paths(repo, remote_name='origin', repeat=3):
+    """测量引用枚举、名称分配、ahead/behind 和合并分析的耗时（毫秒，取最小值）"""
+    def ref_enumeration():
+        return list_branch_names(repo) + list_tag_names(repo)
+    
+    def name_allocation():
+        next_available_name('maintenance_probe', list_branch_names(repo))
+        next_available_name('maintenance_probe', list_tag_names(repo))
+    
+    def ahead_behind():
+        repo.git.for_each_ref('--format=%(refname) %(upstream:track)', 'refs/heads')
+    
+    def merge_analysis():
+        branches = [('branch', head.name) for head in list(repo.heads)[:20]]
+        analyze_merge_candidates(repo, branches, remote_name)
+    
+    timings = {}
+    for name, func in (('ref enumeration', ref_enumeration), 
+                       ('name allocation', name_allocation), 
+                       ('ahead/behind', ahead_behind), 
+                       ('merge analysis', merge_analysis)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                func()
+            except Exception:
+                best = None
+                break
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    return timings
+
+def plan_maintenance(report, thresholds=None, force=False, remote_name='origin'):
+    """根据检查结果和阈值决定需要执行的优化"""
+    thresholds = dict(MAINTENANCE_THRESHOLDS, **(thresholds or {}))
+    actions = []
+    if force or report['loose_refs'] >= thresholds['loose_refs']:
+        actions.append(('pack refs', ['pack-refs', '--all']))
+    if force or report['loose_objects'] >= thresholds['loose_objects']:
+        actions.append(('repack loose objects', ['repack', '-d', '-l']))
+    if len(report['stale_remote_refs']) >= thresholds['stale_remote_refs']:
+        actions.append(('prune stale remote-tracking refs', ['remote', 'prune', remote_name]))
+    if force or actions or not report['commit_graph']:
+        # 其他优化会改变对象布局，commit-graph 放在最后写入
+        actions.append(('write commit-graph', ['commit-graph', 'write', '--reachable']))
+    return actions
+
+def run_maintenance(repo, remote_name='origin', thresholds=None, force=False, 
+                    dry_run=False, log=print):
+    """检查仓库并在超过阈值时执行优化，报告优化前后热点路径的耗时"""
+    report = inspect_repository(repo, remote_name)
+    log(f"Loose refs: {report['loose_refs']}, loose objects: {report['loose_objects']}, "
+        f"packs: {report['packs']}, commit-graph: {'yes' if report['commit_graph'] else 'no'}, "
+        f"stale remote-tracking refs: {len(report['stale_remote_refs'])}")
+    
+    actions = plan_maintenance(report, thresholds, force, remote_name)
+    if not actions:
+        log("Repository is within all maintenance thresholds")
+        return {'report': report, 'actions': [], 'before': {}, 'after': {}}
+    if dry_run:
+        for name, args in actions:
+            log(f"Would run {name}: git {' '.join(args)}")
+        return {'report': report, 'actions': [name for name, _ in actions], 'before': {}, 'after': {}}
+    
+    before = benchmark_hot_paths(repo, remote_name)
+    for name, args in actions:
+        start = time.perf_counter()
+        repo.git.execute(['git'] + args)
+        log(f"Ran {name} in {time.perf_counter() - start:.2f}s")
+    after = benchmark_hot_paths(repo, remote_name)
+    
+    for name in before:
+        before_text = f"{before[name]:.1f} ms" if before[name] is not None else "n/a"
+        after_text = f"{after[name]:.1f} ms" if after[name] is not None else "n/a"
+        log(f"  {name:<16} {before_text:>10} -> {after_text:>10}")
+    return {'report': report, 'actions': [name for name, _ in actions], 
+            'before': before, 'after': after}
+
+# 推送被拒绝的原因中表示远程已有同名引用的部分
+PUSH_COLLISION_REASONS = ('(stale info)', '(already exists)', '(fetch first)')
+# 远程在原子事务中与并发推送争用同一引用时的错误信息
+PUSH_COLLISION_ERRORS = ('cannot lock ref',)
+# 本地事务因同名引用已存在或引用锁被其他进程持有而失败时的错误信息
+UPDATE_REF_COLLISION_ERRORS = ('reference already exists', 'File exists')
+
+def push_new_refs(repo, remote_name, reserved):
+    """原子地推送新引用，任何名称在远程已存在时撤销本次推送并返回 False"""
+    leases = [f"--force-with-lease={ref}:" for _, _, ref, _ in reserved]
+    refspecs = [f"{ref}:{ref}" for _, _, ref, _ in reserved]
+    try:
+        output = repo.git.push('--porcelain', '--atomic', *leases, remote_name, *refspecs)
+    except git.GitCommandError as e:
+        # 原子推送被拒绝时远程没有任何改动；只有租约或同名引用导致的拒绝才是名称冲突，
+        # 钩子、权限、网络等其他错误原样抛出
+        reasons = [line.split('\t')[-1] for line in str(e.stdout).splitlines() 
+                   if line.startswith('!\t')]
+        if any(reason in line for line in reasons for reason in PUSH_COLLISION_REASONS):
+            return False
+        if any(error in str(e.stderr) for error in PUSH_COLLISION_ERRORS):
+            return False
+        raise
+    
+    # 远程已有指向同一提交的同名引用时推送显示为 up to date，同样视为名称冲突
+    created = []
+    conflict = False
+    for line in output.splitlines():
+        parts = line.split('\t')
+        if len(parts) < 2 or ':' not in parts[1]:
+            continue
+        ref = parts[1].split(':', 1)[1]
+        if parts[0] == '=':
+            conflict = True
+        else:
+            created.append(ref)
+    if conflict and created:
+        shas = {ref: sha for _, _, ref, sha in reserved}
+        leases = [f"--force-with-lease={ref}:{shas[ref]}" for ref in created]
+        repo.git.push('--atomic', *leases, remote_name, *[f":{ref}" for ref in created])
+    return not conflict
+
+def create_refs_atomically(repo, branches=(), tags=(), remote_name='origin', push=False, 
+                           max_attempts=5):
+    """在一个 update-ref --stdin 事务中批量预留名称并创建分支和标签
+
+    branches 和 tags 为 (基础名称, 目标引用) 列表，名称按现有引用分配数字后缀。
+    其他进程抢先创建同名引用时整个事务失败，重新分配名称后重试；推送时
+    远程已有同名引用则回滚本地引用并重试。
+    返回 {'branches': [...], 'tags': [...]}。
+    """
+    pool = get_cat_file_pool(repo)
+    requests = []
+    for kind, items in (('branch', branches), ('tag', tags)):
+        for base_name, target in items:
+            sha = pool.resolve(target)
+            if not sha:
+                raise ValueError(f"Unknown target for {base_name}: {target}")
+            ref_prefix = 'refs/heads/' if kind == 'branch' else 'refs/tags/'
+            try:
+                repo.git.check_ref_format(ref_prefix + base_name)
+            except git.GitCommandError:
+                raise ValueError(f"Invalid {kind} name: {base_name}")
+            requests.append((kind, base_name, sha))
+    if not requests:
+        return {'branches': [], 'tags': []}
+    
+    for attempt in range(max_attempts):
+        # 同一批次内依次分配名称，避免批次内部重名
+        existing = {'branch': set(list_branch_names(repo)), 'tag': set(list_tag_names(repo))}
+        reserved = []
+        for kind, base_name, sha in requests:
+            name = next_available_name(base_name, existing[kind])
+            existing[kind].add(name)
+            ref = f"refs/heads/{name}" if kind == 'branch' else f"refs/tags/{name}"
+            reserved.append((kind, name, ref, sha))
+        
+        transaction = ''.join(f"create {ref} {sha}\n" for _, _, ref, sha in reserved)
+        try:
+            run_git_with_input(repo, ['update-ref', '--stdin'], 
+                               f"start\n{transaction}prepare\ncommit\n")
+        except git.GitCommandError as e:
+            # 只有名称已被其他进程占用或引用被锁定时才重试，目录/文件冲突等错误原样抛出
+            if not any(error in str(e.stderr) for error in UPDATE_REF_COLLISION_ERRORS):
+                raise
+            # 随机退避后重新分配
+            time.sleep(random.uniform(0, 0.02 * 2 ** min(attempt, 5)))
+            continue
+        
+        if push:
+            rollback = ''.join(f"delete {ref} {sha}\n" for _, _, ref, sha in reserved)
+            try:
+                pushed = push_new_refs(repo, remote_name, reserved)
+            except git.GitCommandError:
+                # 推送因其他原因失败：回滚本地引用后抛出原始错误
+                run_git_with_input(repo, ['update-ref', '--stdin'], 
+                                   f"start\n{rollback}prepare\ncommit\n")
+                raise
+            if not pushed:
+                # 远程已有同名引用：回滚本地引用，获取远程最新引用后重试
+                run_git_with_input(repo, ['update-ref', '--stdin'], 
+                                   f"start\n{rollback}prepare\ncommit\n")
+                repo.git.fetch(remote_name, '--tags')
+                time.sleep(random.uniform(0, 0.02 * 2 ** min(attempt, 5)))
+                continue
+        
+        return {
+            'branches': [name for kind, name, _, _ in reserved if kind == 'branch'],
+            'tags': [name for kind, name, _, _ in reserved if kind == 'tag']
+        }
+    raise RuntimeError(f"Could not reserve unique ref names after {max_attempts} attempts")
+
+def find_octopus_merge_set(repo, candidates, start='HEAD'):
+    """从 start 开始用 merge-tree 逐个试合并，返回 (可一起干净合并的候选项, 合并后的树, 冲突的候选项)
+
+    每次试合并的结果写成不被任何引用指向的临时提交，作为下一次试合并的基础，
+    整个过程不修改工作区和索引。
+    """
+    current = repo.git.rev_parse(start)
+    tree = None
+    clean = []
+    conflicts = []
+    for candidate in candidates:
+        try:
+            output = repo.git.merge_tree('--write-tree', current, candidate['sha'])
+        except git.GitCommandError as e:
+            if e.status != 1:
+                raise
+            conflicts.append(candidate)
+            continue
+        tree = output.splitlines()[0]
+        current = repo.git.commit_tree(tree, '-p', current, '-p', candidate['sha'], 
+                                       '-m', 'octopus probe')
+        clean.append(candidate)
+    return clean, tree, conflicts
+
+def octopus_merge(repo, candidates):
+    """将互不冲突的候选项合并为一个提交，返回 (已合并的候选项, 需要逐个合并的候选项)"""
+    if repo.git.version_info < (2, 38):
+        raise RuntimeError("Octopus mode requires git 2.38 or newer (merge-tree --write-tree)")
+    
+    clean, tree, conflicts = find_octopus_merge_set(repo, candidates)
+    if len(clean) < 2:
+        # 只有一个干净的候选项时不需要章鱼合并，全部按原顺序逐个合并
+        return [], list(candidates)
+    
+    try:
+        current = repo.active_branch.name
+    except TypeError:
+        current = 'HEAD'
+    message = "Merge " + ", ".join(f"{c['kind']} '{c['name']}'" for c in clean) + f" into {current}"
+    parents = []
+    for candidate in clean:
+        parents += ['-p', candidate['sha']]
+    commit = repo.git.commit_tree(tree, '-p', 'HEAD', *parents, '-m', message)
+    
+    # 新提交是 HEAD 的后代，快进即可一次性更新工作区
+    repo.git.merge('--ff-only', commit)
+    return clean, conflicts
+
+def compute_merge_preview(repo, head_sha, candidate_sha, max_commits=50, max_paths=200):
+    """计算合并候选项将带入的变更：diffstat、提交列表和涉及的路径"""
+    diff_range = f"{head_sha}...{candidate_sha}"
+    diffstat = repo.git.diff('--stat=100,60', '--stat-count=50', diff_range)
+    commits = repo.git.log('--oneline', f'--max-count={max_commits + 1}', 
+                           f"{head_sha}..{candidate_sha}").splitlines()
+    paths = repo.git.diff('--name-status', diff_range).splitlines()
+    return {
+        'diffstat': diffstat,
+        'commits': commits[:max_commits],
+        'more_commits': len(commits) > max_commits,
+        'paths': paths[:max_paths],
+        'more_paths': len(paths) - max_paths if len(paths) > max_paths else 0
+    }
+
+def format_merge_preview(name, preview):
+    """格式化合并预览文本"""
+    lines = [f"{name}: {len(preview['commits'])}{'+' if preview['more_commits'] else ''} commits", ""]
+    lines.extend(preview['commits'] or ["(already merged)"])
+    if preview['diffstat']:
+        lines += ["", preview['diffstat']]
+    if preview['paths']:
+        lines += ["", "Touched paths:"] + preview['paths']
+        if preview['more_paths']:
+            lines.append(f"... and {preview['more_paths']} more")
+    return "\n".join(lines)
+
+class MergePreviewer:
+    """在后台线程中计算合并预览，并按 (HEAD SHA, 候选 SHA) 缓存结果"""
+
+    def __init__(self, repo_path, max_entries=256):
+        self.repo_path = repo_path
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        threading.Thread(target=self._worker, name="merge-preview", daemon=True).start()
+
+    def get(self, key):
+        """返回缓存的预览，未缓存时返回 None"""
+        with self.lock:
+            preview = self.cache.get(key)
+            if preview is not None:
+                self.cache.move_to_end(key)
+            return preview
+
+    def request(self, key, name):
+        """请求在后台计算预览，结果放入 results 队列"""
+        self.requests.put((key, name))
+
+    def _worker(self):
+        """只计算最新的请求，快速移动选择时跳过中间的候选项"""
+        repo = git.Repo(self.repo_path)
+        while True:
+            key, name = self.requests.get()
+            while not self.requests.empty():
+                key, name = self.requests.get_nowait()
+            
+            preview = self.get(key)
+            if preview is None:
+                try:
+                    preview = compute_merge_preview(repo, *key)
+                except Exception as e:
+                    self.results.put((key, name, None, str(e)))
+                    continue
+                with self.lock:
+                    self.cache[key] = preview
+                    while len(self.cache) > self.max_entries:
+                        self.cache.popitem(last=False)
+            self.results.put((key, name, preview, None))
+
+class ReleaseStep:
+    """发布计划中的单个步骤"""
+
+    def __init__(self, name, kind, action, deps=()):
+        self.name = name
+        self.kind = kind
+        self.action = action
+        self.deps = list(deps)
+
+class ReleasePlanExecutor:
+    """将发布计划转换为依赖图，并发执行互不依赖的步骤"""
+
+    def __init__(self, plan, repo_path=None, max_workers=4, log=print, 
+                 timings_path=PLAN_TIMINGS_FILE):
+        self.plan = plan
+        self.repo = git.Repo(repo_path or os.getcwd())
+        self.max_workers = max_workers
+        self.log = log
+        self.timings_path = timings_path
+        self.branch_name = ''
+        self.tag_name = ''
+        self.merge_revs = {}
+        self.steps = self.build_steps()
+
+    def build_steps(self):
+        """构建步骤依赖图"""
+        plan = self.plan
+        steps = [
+            ReleaseStep('fetch', 'fetch', self.step_fetch),
+            ReleaseStep('fetch-tags', 'fetch', self.step_fetch_tags),
+            ReleaseStep('resolve-names', 'resolve', self.step_resolve_names, 
+                        ['fetch', 'fetch-tags'])
+        ]
+        
+        # 冲突检查互不依赖，可并发执行
+        checks = []
+        for item in plan['merge']:
+            steps.append(ReleaseStep(f"check:{item}", 'check', 
+                                     lambda item=item: self.step_check(item), 
+                                     ['fetch', 'fetch-tags']))
+            checks.append(f"check:{item}")
+        
+        # 按合并顺序累积检查，发现合并项目之间的冲突
+        steps.append(ReleaseStep('check-combined', 'check', self.step_check_combined, checks))
+        
+        steps.append(ReleaseStep('create-branch', 'create-branch', self.step_create_branch, 
+                                 ['resolve-names', 'check-combined']))
+        
+        # 合并必须按顺序执行
+        previous = 'create-branch'
+        for item in plan['merge']:
+            steps.append(ReleaseStep(f"merge:{item}", 'merge', 
+                                     lambda item=item: self.step_merge(item), [previous]))
+            previous = f"merge:{item}"
+        
+        if plan['push']['branch']:
+            steps.append(ReleaseStep('push-branch', 'push', self.step_push_branch, [previous]))
+        if plan.get('tag'):
+            steps.append(ReleaseStep('create-tag', 'create-tag', self.step_create_tag, [previous]))
+            if plan['push']['tag']:
+                steps.append(ReleaseStep('push-tag', 'push', self.step_push_tag, ['create-tag']))
+        return steps
+
+    def step_fetch(self):
+        """获取远程分支"""
+        self.repo.git.fetch(self.plan['remote'])
+
+    def step_fetch_tags(self):
+        """获取远程标签"""
+        self.repo.git.fetch(self.plan['remote'], '--tags')
+
+    def step_resolve_names(self):
+        """解析最终分支和标签名称"""
+        plan = self.plan
+        branch = plan['branch']
+        self.branch_name = next_available_name(
+            build_base_name(branch['prefix'], branch['suffix'], branch['date']), 
+            list_branch_names(self.repo))
+        if not self.branch_name:
+            raise ValueError("Resolved branch name is empty")
+        if plan.get('tag'):
+            tag = plan['tag']
+            self.tag_name = next_available_name(
+                build_base_name(tag['prefix'], tag['suffix'], tag['date']), 
+                list_tag_names(self.repo))
+            if not self.tag_name:
+                raise ValueError("Resolved tag name is empty")
+
+    def step_check(self, item):
+        """检查合并项目与基础项目是否冲突"""
+        rev = resolve_merge_rev(self.repo, item, self.plan['remote'])
+        self.merge_revs[item] = rev
+        base = resolve_merge_rev(self.repo, self.plan['base'], self.plan['remote'])
+        try:
+            self.repo.git.merge_tree('--write-tree', '--name-only', base, rev)
+        except git.GitCommandError as e:
+            raise RuntimeError(f"{item} conflicts with {self.plan['base']}:\n{e.stdout}")
+
+    def step_check_combined(self):
+        """按合并顺序链式试合并，检查合并项目之间是否冲突"""
+        if len(self.plan['merge']) < 2:
+            return
+        pool = get_cat_file_pool(self.repo)
+        candidates = [{'name': item, 'sha': pool.resolve(self.merge_revs[item])} 
+                      for item in self.plan['merge']]
+        base = resolve_merge_rev(self.repo, self.plan['base'], self.plan['remote'])
+        _, _, conflicts = find_octopus_merge_set(self.repo, candidates, start=base)
+        if conflicts:
+            names = ', '.join(c['name'] for c in conflicts)
+            raise RuntimeError(f"Merge items conflict with earlier items in the plan: {names}")
+
+    def step_create_branch(self):
+        """从基础项目创建新分支"""
+        self.repo.git.checkout(self.plan['base'])
+        self.repo.git.checkout('-b', self.branch_name)
+
+    def step_merge(self, item):
+        """合并单个项目"""
+        try:
+            self.repo.git.merge(self.merge_revs[item], '--no-ff')
+        except git.GitCommandError:
+            self.repo.git.merge('--abort')
+            raise
+
+    def step_create_tag(self):
+        """创建新标签"""
+        self.repo.create_tag(self.tag_name)
+
+    def step_push_branch(self):
+        """推送新分支到远程"""
+        self.repo.git.push(self.plan['remote'], self.branch_name)
+
+    def step_push_tag(self):
+        """推送新标签到远程"""
+        self.repo.git.push(self.plan['remote'], self.tag_name)
+
+    def load_timings(self):
+        """读取各类步骤的历史耗时"""
+        try:
+            with open(self.timings_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_timings(self, durations):
+        """以指数移动平均更新各类步骤的历史耗时"""
+        timings = self.load_timings()
+        for step in self.steps:
+            if step.name in durations:
+                previous = timings.get(step.kind)
+                duration = durations[step.name]
+                timings[step.kind] = duration if previous is None else 0.7 * previous + 0.3 * duration
+        with open(self.timings_path, 'w', encoding='utf-8') as f:
+            json.dump(timings, f, indent=2)
+
+    def dry_run(self):
+        """打印解析后的名称和预计耗时，不修改仓库"""
+        self.step_resolve_names()
+        timings = self.load_timings()
+        
+        self.log(f"Branch: {self.branch_name}")
+        if self.tag_name:
+            self.log(f"Tag: {self.tag_name}")
+        
+        # 按依赖关系计算每个步骤的最早完成时间
+        finish = {}
+        for step in self.steps:
+            expected = timings.get(step.kind)
+            start = max((finish[dep] for dep in step.deps), default=0.0)
+            finish[step.name] = start + (expected or 0.0)
+            expected_text = f"{expected:.2f}s" if expected is not None else "unknown"
+            deps_text = ', '.join(step.deps) if step.deps else '-'
+            self.log(f"  {step.name:<30} expected {expected_text:<8} after {deps_text}")
+        self.log(f"Expected total: {max(finish.values(), default=0.0):.2f}s")
+
+    def run(self):
+        """执行发布计划，返回各步骤耗时"""
+        pending = {step.name: step for step in self.steps}
+        done = set()
+        durations = {}
+        running = {}
+        failure = None
+        
+        def timed(step):
+            start = time.perf_counter()
+            step.action()
+            return time.perf_counter() - start
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                # 提交所有依赖已完成的步骤
+                if failure is None:
+                    for name, step in list(pending.items()):
+                        if all(dep in done for dep in step.deps):
+                            self.log(f"Starting {name}")
+                            running[pool.submit(timed, step)] = step
+                            del pending[name]
+                if not running:
+                    break
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    try:
+                        durations[step.name] = future.result()
+                        done.add(step.name)
+                        self.log(f"Finished {step.name} in {durations[step.name]:.2f}s")
+                    except Exception as e:
+                        self.log(f"Failed {step.name}: {e}")
+                        if failure is None:
+                            failure = e
+        
+        self.save_timings(durations)
+        if failure is not None:
+            raise failure
+        if pending:
+            # 依赖永远无法满足的步骤不能当作成功
+            raise RuntimeError(f"Release plan steps never became runnable: {', '.join(pending)}")
+        return durations
+
+def default_daemon_address():
+    """每个用户独立的默认守护进程地址"""
+    if not hasattr(socket, 'AF_UNIX'):
+        return '127.0.0.1:8765'
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'easy_branch.sock')
+    return os.path.join(tempfile.gettempdir(), f'easy_branch-{os.getuid()}.sock')
+
+DAEMON_ADDRESS = default_daemon_address()
+
+def daemon_token_path(address):
+    """TCP 守护进程的访问令牌文件，只有当前用户可读"""
+    _, (_, port) = parse_daemon_address(address)
+    return os.path.join(os.path.expanduser('~'), f'.easy_branch-{port}.token')
+
+def parse_daemon_address(address):
+    """解析守护进程地址，host:port 为 TCP，其他为 Unix 套接字路径"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and os.sep not in address:
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+class RepositoryState:
+    """守护进程中单个仓库的常驻状态：引用缓存、cat-file 进程和修改操作队列"""
+
+    def __init__(self, path):
+        self.repo = git.Repo(path)
+        self.pool = get_cat_file_pool(self.repo)
+        self.remote_name = self.repo.remotes[0].name if self.repo.remotes else 'origin'
+        self.lock = threading.Lock()
+        self.ref_cache = None
+        self.ref_cache_key = None
+        self.jobs = queue.Queue()
+        threading.Thread(target=self._worker, name=f"repo-worker:{path}", daemon=True).start()
+
+    def _refs_key(self):
+        """packed-refs 和各引用目录下所有条目的修改时间，用于判断缓存是否失效
+
+        逐层遍历引用目录，子目录中的引用（如 refs/heads/team/x）变化同样能被发现。
+        """
+        packed = os.path.join(self.repo.git_dir, 'packed-refs')
+        try:
+            key = [(packed, os.stat(packed).st_mtime_ns)]
+        except OSError:
+            key = [(packed, None)]
+        for top in ('refs/heads', 'refs/tags', f'refs/remotes/{self.remote_name}'):
+            for dirpath, dirnames, filenames in os.walk(os.path.join(self.repo.git_dir, top)):
+                for name in dirnames + filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        key.append((path, os.stat(path).st_mtime_ns))
+                    except OSError:
+                        pass
+        return tuple(sorted(key, key=lambda item: item[0]))
+
+    def refs(self, refresh=False):
+        """返回缓存的分支和标签列表"""
+        with self.lock:
+            key = self._refs_key()
+            if refresh or self.ref_cache is None or key != self.ref_cache_key:
+                self.ref_cache = {
+                    'branches': sorted(list_branch_names(self.repo)),
+                    'tags': sorted(list_tag_names(self.repo))
+                }
+                self.ref_cache_key = key
+            return self.ref_cache
+
+    def invalidate(self):
+        """修改操作后清空引用缓存"""
+        with self.lock:
+            self.ref_cache = None
+
+    def submit(self, func, *args):
+        """将修改操作加入队列按顺序执行，等待并返回结果"""
+        future = Future()
+        self.jobs.put((future, func, args))
+        return future.result()
+
+    def _worker(self):
+        """按顺序执行队列中的修改操作"""
+        while True:
+            future, func, args = self.jobs.get()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self.invalidate()
+
+class GitToolService:
+    """守护进程提供的 JSON-RPC 方法"""
+
+    def __init__(self, default_repo=None):
+        self.default_repo = os.path.abspath(default_repo or os.getcwd())
+        self.repos = {}
+        self.repos_lock = threading.Lock()
+        self.started = time.time()
+        self.request_count = 0
+
+    def state(self, repo=None):
+        """获取（必要时创建）仓库的常驻状态"""
+        path = os.path.abspath(repo or self.default_repo)
+        with self.repos_lock:
+            state = self.repos.get(path)
+            if state is None:
+                state = RepositoryState(path)
+                self.repos[path] = state
+            return state
+
+    def rpc_ping(self):
+        """返回守护进程状态"""
+        return {'pid': os.getpid(), 'uptime': time.time() - self.started, 
+                'requests': self.request_count, 'repos': sorted(self.repos)}
+
+    def rpc_list_refs(self, repo=None, refresh=False):
+        """列出分支和标签"""
+        return self.state(repo).refs(refresh)
+
+    def rpc_branch_name(self, prefix, custom='', date=None, repo=None, fetch=False):
+        """分配下一个可用的分支名称"""
+        state = self.state(repo)
+        if fetch:
+            state.submit(state.repo.git.fetch, state.remote_name)
+        base_name = build_base_name(prefix, custom, date or datetime.now().strftime('%Y.%m.%d'))
+        return next_available_name(base_name, state.refs()['branches']) if base_name else ''
+
+    def rpc_tag_name(self, prefix, custom='', date=None, repo=None, fetch=False):
+        """分配下一个可用的标签名称"""
+        state = self.state(repo)
+        if fetch:
+            state.submit(state.repo.git.fetch, state.remote_name, '--tags')
+        base_name = build_base_name(prefix, custom, date or datetime.now().strftime('%Y.%m.%d'))
+        return next_available_name(base_name, state.refs()['tags']) if base_name else ''
+
+    def rpc_fetch(self, repo=None):
+        """获取远程分支和标签"""
+        state = self.state(repo)
+        state.submit(state.repo.git.fetch, state.remote_name, '--tags')
+        return state.refs(refresh=True)
+
+    def rpc_create_branch(self, name, base, repo=None):
+        """通过引用事务从基础项目创建新分支并检出，返回实际使用的名称"""
+        state = self.state(repo)
+        
+        def create():
+            created = create_refs_atomically(state.repo, [(name, base)], (), state.remote_name)
+            branch_name = created['branches'][0]
+            state.repo.git.checkout(branch_name)
+            return branch_name
+        return state.submit(create)
+
+    def rpc_merge(self, items, repo=None, optimize=False, octopus=False, stop_on_error=True):
+        """按顺序合并分支和标签"""
+        state = self.state(repo)
+        
+        def merge():
+            merge_items = [(kind, name, resolve_merge_rev(state.repo, name, state.remote_name)) 
+                           for kind, name in ((item.get('kind', 'branch'), item['name']) 
+                                              if isinstance(item, dict) else ('branch', item) 
+                                              for item in items)]
+            if optimize:
+                candidates = analyze_merge_candidates(
+                    state.repo, [(kind, name) for kind, name, _ in merge_items], state.remote_name)
+                merge_items = [(c['kind'], c['name'], c['rev']) 
+                               for c in order_merge_candidates(candidates)]
+            results = []
+            if octopus:
+                # 章鱼合并不可用（如 git 版本过旧）时退回逐个合并
+                try:
+                    candidates = analyze_merge_candidates(
+                        state.repo, [(kind, name) for kind, name, _ in merge_items], state.remote_name)
+                    merged, leftovers = octopus_merge(state.repo, 
+                                                      [c for c in candidates if not c['merged']])
+                except Exception:
+                    pass
+                else:
+                    results += [{'kind': c['kind'], 'name': c['name'], 'merged': True, 'octopus': True} 
+                                for c in merged]
+                    merge_items = [(c['kind'], c['name'], c['rev']) for c in leftovers]
+            for kind, name, rev in merge_items:
+                try:
+                    state.repo.git.merge(rev, '--no-ff')
+                    results.append({'kind': kind, 'name': name, 'merged': True})
+                except git.GitCommandError as e:
+                    state.repo.git.merge('--abort')
+                    results.append({'kind': kind, 'name': name, 'merged': False, 'error': str(e)})
+                    if stop_on_error:
+                        break
+            return results
+        return state.submit(merge)
+
+    def rpc_create_tag(self, name, repo=None, push=True):
+        """通过引用事务创建并推送新标签，返回实际使用的名称"""
+        state = self.state(repo)
+        
+        def create():
+            created = create_refs_atomically(state.repo, (), [(name, 'HEAD')], 
+                                             state.remote_name, push)
+            return created['tags'][0]
+        return state.submit(create)
+
+    def rpc_create_refs(self, branches=(), tags=(), repo=None, push=False):
+        """在一个引用事务中批量创建分支和标签"""
+        state = self.state(repo)
+        return state.submit(create_refs_atomically, state.repo, 
+                            [tuple(item) for item in branches], [tuple(item) for item in tags], 
+                            state.remote_name, push)
+
+    def rpc_stats(self, repo=None):
+        """返回 cat-file 进程统计"""
+        return self.state(repo).pool.stats()
+
+    def dispatch(self, request):
+        """处理一个 JSON-RPC 请求，返回响应字典"""
+        self.request_count += 1
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                return {'jsonrpc': '2.0', 'id': request_id, 
+                        'error': {'code': -32600, 'message': "Invalid request"}}
+            method = getattr(self, f"rpc_{request['method']}", None)
+            if method is None:
+                return {'jsonrpc': '2.0', 'id': request_id, 
+                        'error': {'code': -32601, 'message': f"Unknown method: {request['method']}"}}
+            params = request.get('params') or {}
+            args, kwargs = (params, {}) if isinstance(params, list) else ((), params)
+            
+            # 先按方法签名校验参数，方法内部抛出的 TypeError 不算参数错误
+            try:
+                if not isinstance(kwargs, dict):
+                    raise TypeError("params must be an object or an array")
+                inspect.signature(method).bind(*args, **kwargs)
+            except TypeError as e:
+                return {'jsonrpc': '2.0', 'id': request_id, 
+                        'error': {'code': -32602, 'message': str(e)}}
+            result = method(*args, **kwargs)
+            return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except Exception as e:
+            return {'jsonrpc': '2.0', 'id': request_id, 
+                    'error': {'code': -32000, 'message': str(e)}}
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """按行读取 JSON-RPC 请求并逐行返回响应"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {'jsonrpc': '2.0', 'id': None, 
+                            'error': {'code': -32700, 'message': f"Parse error: {e}"}}
+            else:
+                # TCP 连接没有文件权限保护，每个请求都必须带上令牌文件中的令牌
+                token = self.server.token
+                supplied = request.get('token') if isinstance(request, dict) else None
+                if token is not None and not (isinstance(supplied, str) and 
+                                              hmac.compare_digest(supplied, token)):
+                    request_id = request.get('id') if isinstance(request, dict) else None
+                    response = {'jsonrpc': '2.0', 'id': request_id, 
+                                'error': {'code': -32001, 'message': "Unauthorized"}}
+                else:
+                    response = self.server.service.dispatch(request)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class _ThreadingTCPDaemon(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _ThreadingUnixDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+def serve_daemon(address=DAEMON_ADDRESS, default_repo=None):
+    """启动本地 JSON-RPC 守护进程，直到被中断"""
+    family, bind_address = parse_daemon_address(address)
+    
+    # 已有守护进程在该地址响应时拒绝启动，避免抢占正在使用的地址
+    probe = socket.socket(family, socket.SOCK_STREAM)
+    probe.settimeout(1)
+    try:
+        probe.connect(bind_address)
+    except (ConnectionRefusedError, FileNotFoundError):
+        pass
+    except PermissionError:
+        raise RuntimeError(f"Daemon address {address} belongs to another user")
+    except socket.timeout:
+        # 有进程持有该地址但没有及时响应，同样视为正在使用
+        raise RuntimeError(f"Daemon address {address} is in use by an unresponsive process")
+    else:
+        raise RuntimeError(f"A daemon is already listening on {address}")
+    finally:
+        probe.close()
+    
+    if family == socket.AF_UNIX:
+        # 没有进程响应，说明是上次异常退出留下的套接字文件
+        if os.path.exists(bind_address):
+            os.remove(bind_address)
+        server = _ThreadingUnixDaemon(bind_address, _DaemonRequestHandler)
+        os.chmod(bind_address, 0o600)
+        server.token = None
+    else:
+        server = _ThreadingTCPDaemon(bind_address, _DaemonRequestHandler)
+        server.token = secrets.token_hex(32)
+        token_path = daemon_token_path(address)
+        fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(server.token)
+    server.service = GitToolService(default_repo)
+    print(f"Git tool daemon listening on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.remove(bind_address)
+        elif family != socket.AF_UNIX and os.path.exists(token_path):
+            os.remove(token_path)
+
+class GitToolDaemonClient:
+    """守护进程的 JSON-RPC 客户端，保持一个长连接"""
+
+    def __init__(self, address=DAEMON_ADDRESS, timeout=300):
+        family, connect_address = parse_daemon_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.token = None
+        if family != socket.AF_UNIX:
+            try:
+                with open(daemon_token_path(address), encoding='utf-8') as f:
+                    self.token = f.read().strip()
+            except OSError as e:
+                raise RuntimeError(f"Cannot read daemon token for {address}: {e}")
+        self.sock.connect(connect_address)
+        self.rfile = self.sock.makefile('rb')
+        self.lock = threading.Lock()
+        self.next_id = 0
+
+    def call(self, method, **params):
+        """调用远程方法，出错时抛出 RuntimeError"""
+        with self.lock:
+            self.next_id += 1
+            request = {'jsonrpc': '2.0', 'id': self.next_id, 'method': method, 'params': params}
+            if self.token is not None:
+                request['token'] = self.token
+            self.sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+            line = self.rfile.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(response['error']['message'])
+        return response['result']
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+PROFILE_DIR = 'git_tool_profile'
+
+class TkStallWatchdog:
+    """通过 root.after 定时器测量 Tk 事件循环延迟，卡顿超过阈值时从辅助线程抓取主线程堆栈"""
+
+    def __init__(self, root, threshold_ms=500, interval_ms=100, log=None):
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.log = log
+        self.main_thread_id = threading.get_ident()
+        self.messages = queue.Queue()
+        self.stop_event = threading.Event()
+        self.last_tick = time.perf_counter()
+        self.reported = False
+        self.max_latency_ms = 0.0
+        self.stalls = 0
+        self.after_id = None
+
+    def start(self):
+        """启动定时器和监控线程"""
+        self.last_tick = time.perf_counter()
+        self.after_id = self.root.after(int(self.interval * 1000), self._tick)
+        threading.Thread(target=self._monitor, name="tk-stall-watchdog", daemon=True).start()
+
+    def stop(self):
+        """停止监控"""
+        self.stop_event.set()
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        """在主线程中运行，记录定时器的实际延迟"""
+        now = time.perf_counter()
+        latency_ms = max(0.0, (now - self.last_tick - self.interval) * 1000)
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.last_tick = now
+        self.reported = False
+        
+        # 将监控线程捕获的堆栈写入界面日志
+        while not self.messages.empty():
+            message, details = self.messages.get_nowait()
+            if self.log:
+                self.log(message, details)
+        
+        if not self.stop_event.is_set():
+            self.after_id = self.root.after(int(self.interval * 1000), self._tick)
+
+    def _monitor(self):
+        """在辅助线程中运行，检测卡顿并抓取主线程堆栈"""
+        while not self.stop_event.wait(self.interval / 2):
+            stalled = time.perf_counter() - self.last_tick - self.interval
+            if stalled < self.threshold or self.reported:
+                continue
+            self.reported = True
+            self.stalls += 1
+            
+            frame = sys._current_frames().get(self.main_thread_id)
+            stack = ''.join(traceback.format_stack(frame)) if frame else "<no stack>"
+            message = f"Event loop stalled for {stalled * 1000:.0f} ms"
+            # 主线程阻塞时界面日志无法更新，先输出到标准错误
+            print(f"{message}\n{stack}", file=sys.stderr)
+            self.messages.put((message, stack))
+
+class CallbackProfiler:
+    """用 cProfile 包装 UI 回调，按回调分别统计并写出结果"""
+
+    def __init__(self, output_dir=PROFILE_DIR):
+        self.output_dir = output_dir
+        self.profiles = {}
+        self.active = False
+
+    def wrap(self, name, callback):
+        """返回带性能分析的回调，嵌套调用计入最外层回调"""
+        def wrapper(*args, **kwargs):
+            if self.active:
+                return callback(*args, **kwargs)
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            self.active = True
+            profile.enable()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                profile.disable()
+                self.active = False
+        return wrapper
+
+    def dump(self):
+        """写出每个回调的 .prof 文件和汇总报告"""
+        if not self.profiles:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            for name, profile in sorted(self.profiles.items()):
+                profile.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+                f.write(f"===== {name} =====\n")
+                stats = pstats.Stats(profile, stream=f)
+                stats.sort_stats('cumulative').print_stats(15)
+
+# 启用性能分析时需要包装的 UI 回调
+UI_CALLBACKS = ['refresh_branch_name', 'refresh_merge_items', 'refresh_tag_name', 
+                'update_base_items', 'on_base_item_selected', 'create_branch', 
+                'merge_branches', 'create_tag', 'save_current_event', 'show_event_history', 
+                'show_event_analytics', 'export_event_history', 'import_event_history', 
+                'show_git_stats', 'run_repository_maintenance', 'preview_merge_candidate']
+
 class GitEventManager:
-    def __init__(self):
+    def __init__(self, profile=False, stall_threshold_ms=500, daemon_address=None):
         print("Initializing GUI...")
         self.root = tk.Tk()
         print("GUI initialized successfully")
@@ -32,6 +1772,9 @@ class GitEventManager:
         self.repo = git.Repo(os.getcwd())
         print("Git repository initialized successfully")
         
+        # 连接共享的守护进程（可选），用于分配名称
+        self.daemon = GitToolDaemonClient(daemon_address) if daemon_address else None
+        
         # 初始化操作计数
         self.operation_count = 0
         
@@ -52,7 +1795,22 @@ class GitEventManager:
         self.event_notes = tk.StringVar()
         
         self.merge_vars = {'branch': {}, 'tag': {}}
-        self.events = []
+        self.optimize_merge_order = tk.BooleanVar(value=False)
+        self.octopus_merge = tk.BooleanVar(value=False)
+        self.merge_previewer = MergePreviewer(self.repo.working_dir)
+        self.previewed_merge_key = None
+        self.events = None
+        
+        # 加载事件历史（只读取元数据）和统计汇总表
+        self.load_events_from_file()
+        self.analytics = EventAnalytics()
+        self.analytics.load(self.events)
+        
+        # 按需包装 UI 回调进行性能分析
+        self.profiler = CallbackProfiler() if profile else None
+        if self.profiler:
+            for name in UI_CALLBACKS:
+                setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
         
         # 创建日志和状态文本框
         self.create_log_widgets()
@@ -60,6 +1818,14 @@ class GitEventManager:
         print("Starting UI setup...")
         self.setup_ui()
         print("UI setup completed")
+        
+        # 启动事件循环卡顿监控
+        self.watchdog = None
+        if stall_threshold_ms:
+            self.watchdog = TkStallWatchdog(self.root, stall_threshold_ms, log=self.log_operation)
+            self.watchdog.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(100, self.poll_merge_previews)
 
     def create_log_widgets(self):
         """创建日志和状态文本框"""
@@ -148,9 +1914,10 @@ class GitEventManager:
                 for branch in all_branches:
                     self.merge_vars['branch'][branch] = tk.BooleanVar()
                     display_name = f"{branch} (remote)" if branch in remote_branches else branch
-                    ttk.Checkbutton(self.merge_inner_frame, text=display_name, 
-                                  variable=self.merge_vars['branch'][branch]).grid(
-                        row=row, column=0, sticky='w', padx=20, pady=2)
+                    checkbutton = ttk.Checkbutton(self.merge_inner_frame, text=display_name, 
+                                                  variable=self.merge_vars['branch'][branch])
+                    checkbutton.grid(row=row, column=0, sticky='w', padx=20, pady=2)
+                    self.bind_merge_preview(checkbutton, branch)
                     row += 1
             
             if tags:
@@ -159,9 +1926,10 @@ class GitEventManager:
                 row += 1
                 for tag in sorted(tags):
                     self.merge_vars['tag'][tag] = tk.BooleanVar()
-                    ttk.Checkbutton(self.merge_inner_frame, text=tag, 
-                                  variable=self.merge_vars['tag'][tag]).grid(
-                        row=row, column=0, sticky='w', padx=20, pady=2)
+                    checkbutton = ttk.Checkbutton(self.merge_inner_frame, text=tag, 
+                                                  variable=self.merge_vars['tag'][tag])
+                    checkbutton.grid(row=row, column=0, sticky='w', padx=20, pady=2)
+                    self.bind_merge_preview(checkbutton, tag)
                     row += 1
             
             # 更新画布滚动区域
@@ -197,53 +1965,24 @@ class GitEventManager:
             date = self.branch_date_suffix.get()
             
             # 构建基础分支名称
-            if prefix == 'custom':
-                if not custom:
-                    self.final_branch_name.set('')
-                    return
-                base_name = custom
-            else:
-                base_name = f"{prefix}_{date}"
-                if custom:
-                    base_name = f"{base_name}_{custom}"
+            base_name = build_base_name(prefix, custom, date)
+            if not base_name:
+                self.final_branch_name.set('')
+                return
+            
+            if self.daemon:
+                final_name = self.daemon.call('branch_name', repo=self.repo.working_dir, 
+                                              prefix=prefix, custom=custom, date=date, 
+                                              fetch=force_check)
+                self.final_branch_name.set(final_name)
+                return
             
             # 如果是强制检查，重新获取信息
             if force_check:
                 self.repo.remote().fetch()
             
-            # 获取所有分支（包括远程分支）
-            all_branches = [branch.name for branch in self.repo.heads]
-            remote_branches = [ref.name.split('/')[-1] for ref in self.repo.remote().refs 
-                             if not ref.name.endswith('/HEAD')]
-            existing_branches = list(set(all_branches + remote_branches))
-            
-            # 如果名称已存在，添加数字后缀
-            if base_name in existing_branches:
-                # 查找所有相似的分支名
-                pattern = re.compile(f"^{re.escape(base_name)}(\\.\\d+)?$")
-                similar_branches = [b for b in existing_branches if pattern.match(b)]
-                
-                if similar_branches:
-                    # 找出最大的编号
-                    max_number = 0
-                    for branch in similar_branches:
-                        if branch == base_name:
-                            max_number = max(max_number, 0)
-                        else:
-                            try:
-                                suffix = branch.split('.')[-1]
-                                if suffix.isdigit():
-                                    max_number = max(max_number, int(suffix))
-                            except (IndexError, ValueError):
-                                continue
-                    
-                    # 使用下一个编号
-                    final_name = f"{base_name}.{max_number + 1}"
-                else:
-                    final_name = f"{base_name}.1"
-            else:
-                final_name = base_name
-            
+            # 获取所有分支（包括远程分支），如果名称已存在，添加数字后缀
+            final_name = next_available_name(base_name, list_branch_names(self.repo))
             self.final_branch_name.set(final_name)
             
         except Exception as e:
@@ -258,50 +1997,24 @@ class GitEventManager:
             date = self.tag_date_suffix.get()
             
             # 构建基础标签名称
-            if prefix == 'custom':
-                if not custom:
-                    self.final_tag_name.set('')
-                    return
-                base_name = custom
-            else:
-                base_name = f"{prefix}_{date}"
-                if custom:
-                    base_name = f"{base_name}_{custom}"
+            base_name = build_base_name(prefix, custom, date)
+            if not base_name:
+                self.final_tag_name.set('')
+                return
+            
+            if self.daemon:
+                final_name = self.daemon.call('tag_name', repo=self.repo.working_dir, 
+                                              prefix=prefix, custom=custom, date=date, 
+                                              fetch=force_check)
+                self.final_tag_name.set(final_name)
+                return
             
             # 如果是强制检查，重新获取远程信息
             if force_check:
                 self.repo.git.fetch('--tags')
             
-            # 获取所有标签
-            existing_tags = [tag.name for tag in self.repo.tags]
-            
-            # 如果名称已存在，添加数字后缀
-            if base_name in existing_tags:
-                # 查找所有相似的标签名
-                pattern = re.compile(f"^{re.escape(base_name)}(\\.\\d+)?$")
-                similar_tags = [t for t in existing_tags if pattern.match(t)]
-                
-                if similar_tags:
-                    # 找出最大的编号
-                    max_number = 0
-                    for tag in similar_tags:
-                        if tag == base_name:
-                            max_number = max(max_number, 0)
-                        else:
-                            try:
-                                suffix = tag.split('.')[-1]
-                                if suffix.isdigit():
-                                    max_number = max(max_number, int(suffix))
-                            except (IndexError, ValueError):
-                                continue
-                    
-                    # 使用下一个编号
-                    final_name = f"{base_name}.{max_number + 1}"
-                else:
-                    final_name = f"{base_name}.1"
-            else:
-                final_name = base_name
-            
+            # 获取所有标签，如果名称已存在，添加数字后缀
+            final_name = next_available_name(base_name, list_tag_names(self.repo))
             self.final_tag_name.set(final_name)
             
         except Exception as e:
@@ -415,7 +2128,8 @@ class GitEventManager:
         scrollbar.pack(side="right", fill="y")
         
         # 9. 绑定鼠标滚轮
-        canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
+        canvas.bind_all("<MouseWheel>", self.wrap_callback(
+            'mousewheel', lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units")))
         
         return left_container
 
@@ -490,6 +2204,21 @@ class GitEventManager:
         
         history_btn = ttk.Button(toolbar, text="View History", command=self.show_event_history)
         history_btn.pack(side=tk.RIGHT, padx=5)
+        
+        analytics_btn = ttk.Button(toolbar, text="Analytics", command=self.show_event_analytics)
+        analytics_btn.pack(side=tk.RIGHT, padx=5)
+        
+        stats_btn = ttk.Button(toolbar, text="Git Stats", command=self.show_git_stats)
+        stats_btn.pack(side=tk.LEFT, padx=5)
+        
+        maintenance_btn = ttk.Button(toolbar, text="Maintenance", command=self.run_repository_maintenance)
+        maintenance_btn.pack(side=tk.LEFT, padx=5)
+        
+        export_btn = ttk.Button(toolbar, text="Export", command=self.export_event_history)
+        export_btn.pack(side=tk.RIGHT, padx=5)
+        
+        import_btn = ttk.Button(toolbar, text="Import", command=self.import_event_history)
+        import_btn.pack(side=tk.RIGHT, padx=5)
 
     def update_base_items(self):
         """更新基础项目列表"""
@@ -560,14 +2289,21 @@ class GitEventManager:
             self.log_operation(f"Creating new branch: {new_branch_name}", 
                              f"Base {base_type}: {base_item}")
             
-            # 切换到基础项目
-            if base_type == "branch":
-                self.repo.git.checkout(base_item)
-            else:
-                self.repo.git.checkout(base_item)
-            
-            # 创建新分支
-            self.repo.git.checkout('-b', new_branch_name)
+            # 在一个引用事务中从基础项目创建新分支，名称被抢占时自动使用下一个编号
+            remote_name = self.repo.remote().name
+            base_rev = resolve_merge_rev(self.repo, base_item.split(' (remote)')[0], remote_name)
+            base_name = build_base_name(self.branch_prefix.get(), self.branch_custom_suffix.get(), 
+                                        self.branch_date_suffix.get())
+            result = create_refs_atomically(self.repo, branches=[(base_name, base_rev)], 
+                                            remote_name=remote_name)
+            if result['branches'][0] != new_branch_name:
+                self.log_operation(f"Branch name {new_branch_name} was taken, "
+                                   f"using {result['branches'][0]}")
+                new_branch_name = result['branches'][0]
+                self.final_branch_name.set(new_branch_name)
+            
+            # 切换到新分支
+            self.repo.git.checkout(new_branch_name)
             
             # 更新状态
             self.update_status(f"Created new branch: {new_branch_name}")
@@ -605,36 +2341,29 @@ class GitEventManager:
                              f"Selected branches: {selected_branches}\n"
                              f"Selected tags: {selected_tags}")
             
-            # 合并分支
-            for branch in selected_branches:
-                try:
-                    self.log_operation(f"Merging branch: {branch}")
-                    self.repo.git.merge(branch, '--no-ff')
-                    self.update_status(f"Merged branch: {branch}")
-                except Exception as e:
-                    error_msg = str(e)
-                    self.log_operation(f"Error merging branch {branch}: {error_msg}")
-                    self.update_status(f"Failed to merge branch {branch}", success=False)
-                    if messagebox.askyesno("Error", 
-                                         f"Failed to merge branch {branch}. Continue with remaining items?"):
-                        self.repo.git.merge('--abort')
-                        continue
-                    else:
-                        self.repo.git.merge('--abort')
-                        return
+            # 默认先合并分支再合并标签，每项为 (类型, 名称, 合并引用)
+            merge_items = [('branch', branch, branch) for branch in selected_branches]
+            merge_items += [('tag', tag, tag) for tag in selected_tags]
+            
+            # 按变更文件的重叠情况优化合并顺序
+            if self.optimize_merge_order.get():
+                merge_items = self.plan_merge_order(merge_items)
             
-            # 合并标签
-            for tag in selected_tags:
+            # 章鱼合并模式：互不冲突的项目一次合并，剩余项目逐个合并
+            if self.octopus_merge.get():
+                merge_items = self.octopus_merge_items(merge_items)
+            
+            for kind, name, rev in merge_items:
                 try:
-                    self.log_operation(f"Merging tag: {tag}")
-                    self.repo.git.merge(tag, '--no-ff')
-                    self.update_status(f"Merged tag: {tag}")
+                    self.log_operation(f"Merging {kind}: {name}")
+                    self.repo.git.merge(rev, '--no-ff')
+                    self.update_status(f"Merged {kind}: {name}")
                 except Exception as e:
                     error_msg = str(e)
-                    self.log_operation(f"Error merging tag {tag}: {error_msg}")
-                    self.update_status(f"Failed to merge tag {tag}", success=False)
+                    self.log_operation(f"Error merging {kind} {name}: {error_msg}")
+                    self.update_status(f"Failed to merge {kind} {name}", success=False)
                     if messagebox.askyesno("Error", 
-                                         f"Failed to merge tag {tag}. Continue with remaining items?"):
+                                         f"Failed to merge {kind} {name}. Continue with remaining items?"):
                         self.repo.git.merge('--abort')
                         continue
                     else:
@@ -653,6 +2382,90 @@ class GitEventManager:
             self.update_status("Merge operation failed", success=False)
             messagebox.showerror("Error", f"Merge operation failed: {error_msg}")
 
+    def octopus_merge_items(self, merge_items):
+        """将互不冲突的项目合并为一个提交，返回需要逐个合并的剩余项目"""
+        try:
+            candidates = analyze_merge_candidates(
+                self.repo, [(kind, name) for kind, name, _ in merge_items], self.repo.remote().name)
+            pending = []
+            for candidate in candidates:
+                if candidate['merged']:
+                    self.log_operation(f"Skipping {candidate['kind']} {candidate['name']}: already merged")
+                else:
+                    pending.append(candidate)
+            
+            merged, leftovers = octopus_merge(self.repo, pending)
+            if merged:
+                names = ", ".join(c['name'] for c in merged)
+                self.log_operation(f"Octopus merged {len(merged)} items in one commit", names)
+                self.update_status(f"Octopus merged: {names}")
+            if leftovers:
+                self.log_operation("Merging remaining items sequentially", 
+                                   ", ".join(c['name'] for c in leftovers))
+            return [(c['kind'], c['name'], c['rev']) for c in leftovers]
+        except Exception as e:
+            error_msg = str(e)
+            self.log_operation(f"Octopus merge unavailable, merging sequentially: {error_msg}")
+            return merge_items
+
+    def plan_merge_order(self, merge_items):
+        """根据变更文件重叠情况重新排列合并项目，跳过已合并的项目"""
+        candidates = analyze_merge_candidates(
+            self.repo, [(kind, name) for kind, name, _ in merge_items], self.repo.remote().name)
+        
+        for candidate in candidates:
+            if candidate['merged']:
+                self.log_operation(f"Skipping {candidate['kind']} {candidate['name']}: already merged")
+        
+        ordered = order_merge_candidates(candidates)
+        details = "\n".join(
+            f"{c['kind']} {c['name']}: {len(c['files'])} files"
+            f"{' (fast-forward)' if c['fast_forward'] else ''}" for c in ordered)
+        self.log_operation("Optimized merge order", details)
+        return [(c['kind'], c['name'], c['rev']) for c in ordered]
+
+    def bind_merge_preview(self, widget, name):
+        """鼠标悬停或键盘焦点移到合并项目时显示预览"""
+        widget.bind('<Enter>', lambda e: self.preview_merge_candidate(name))
+        widget.bind('<FocusIn>', lambda e: self.preview_merge_candidate(name))
+
+    def preview_merge_candidate(self, name):
+        """显示合并候选项的预览，未缓存时在后台计算"""
+        try:
+            pool = get_cat_file_pool(self.repo)
+            rev = resolve_merge_rev(self.repo, name, self.repo.remote().name)
+            key = (pool.resolve('HEAD'), pool.resolve(rev))
+        except Exception as e:
+            self.show_merge_preview(f"{name}: {str(e)}")
+            return
+        
+        self.previewed_merge_key = key
+        preview = self.merge_previewer.get(key)
+        if preview is not None:
+            self.show_merge_preview(format_merge_preview(name, preview))
+        else:
+            self.show_merge_preview(f"Computing preview for {name}...")
+            self.merge_previewer.request(key, name)
+
+    def poll_merge_previews(self):
+        """将后台计算完成的预览显示到界面"""
+        while not self.merge_previewer.results.empty():
+            key, name, preview, error = self.merge_previewer.results.get_nowait()
+            if key != self.previewed_merge_key:
+                continue
+            if error:
+                self.show_merge_preview(f"Failed to preview {name}: {error}")
+            else:
+                self.show_merge_preview(format_merge_preview(name, preview))
+        self.root.after(100, self.poll_merge_previews)
+
+    def show_merge_preview(self, text):
+        """更新预览文本框"""
+        self.merge_preview_text.configure(state='normal')
+        self.merge_preview_text.delete('1.0', tk.END)
+        self.merge_preview_text.insert(tk.END, text)
+        self.merge_preview_text.configure(state='disabled')
+
     def create_tag(self):
         """创建新标签"""
         try:
@@ -665,11 +2478,15 @@ class GitEventManager:
             # 记录操作
             self.log_operation(f"Creating new tag: {new_tag_name}")
             
-            # 创建新标签
-            self.repo.create_tag(new_tag_name)
-            
-            # 推送标签到程
-            self.repo.remote().push(new_tag_name)
+            # 在一个引用事务中创建并推送新标签，名称被抢占时自动使用下一个编号
+            base_name = build_base_name(self.tag_prefix.get(), self.tag_custom_suffix.get(), 
+                                        self.tag_date_suffix.get())
+            result = create_refs_atomically(self.repo, tags=[(base_name, 'HEAD')], 
+                                            remote_name=self.repo.remote().name, push=True)
+            if result['tags'][0] != new_tag_name:
+                self.log_operation(f"Tag name {new_tag_name} was taken, using {result['tags'][0]}")
+                new_tag_name = result['tags'][0]
+                self.final_tag_name.set(new_tag_name)
             
             # 更新状态
             self.update_status(f"Created new tag: {new_tag_name}")
@@ -690,6 +2507,23 @@ class GitEventManager:
         """运行应用程序"""
         self.root.mainloop()
 
+    def wrap_callback(self, name, callback):
+        """启用性能分析时包装回调"""
+        if self.profiler:
+            return self.profiler.wrap(name, callback)
+        return callback
+
+    def on_close(self):
+        """关闭窗口时停止监控并写出性能分析结果"""
+        if self.watchdog:
+            self.watchdog.stop()
+            print(f"Event loop: max latency {self.watchdog.max_latency_ms:.0f} ms, "
+                  f"{self.watchdog.stalls} stalls")
+        if self.profiler:
+            self.profiler.dump()
+            print(f"Callback profiles written to {self.profiler.output_dir}")
+        self.root.destroy()
+
     def save_current_event(self):
         """保存当前事件"""
         if not self.event_title.get():
@@ -707,7 +2541,10 @@ class GitEventManager:
         event.notes = self.event_notes.get()
         
         self.events.append(event)
-        self.save_events_to_file()
+        
+        # 增量更新统计汇总表
+        self.analytics.record(event)
+        self.analytics.save(self.events.file_size())
         
         # 显示成功消息
         messagebox.showinfo("Success", "Event saved successfully")
@@ -717,43 +2554,72 @@ class GitEventManager:
         self.event_description.set("")
         self.event_notes.set("")
         
-    def save_events_to_file(self):
-        """将事件保存到文件"""
-        events_data = []
-        for event in self.events:
-            event_dict = {
-                'title': event.title,
-                'date': event.date,
-                'description': event.description,
-                'created_branch': event.created_branch,
-                'merged_branches': event.merged_branches,
-                'created_tag': event.created_tag,
-                'notes': event.notes
-            }
-            events_data.append(event_dict)
-            
-        with open('git_events.json', 'w', encoding='utf-8') as f:
-            json.dump(events_data, f, ensure_ascii=False, indent=2)
-            
     def load_events_from_file(self):
-        """从文件加载事件"""
+        """打开事件历史文件，记录在读取时才解码"""
+        self.events = EventHistory(EVENTS_FILE)
+
+    def export_event_history(self):
+        """导出事件历史"""
+        export_window = tk.Toplevel(self.root)
+        export_window.title("Export Event History")
+        
+        since = tk.StringVar()
+        until = tk.StringVar()
+        prefix = tk.StringVar()
+        fmt = tk.StringVar(value='jsonl')
+        
+        # 过滤条件
+        ttk.Label(export_window, text="Since (YYYY-MM-DD):").grid(row=0, column=0, sticky='w', padx=5, pady=5)
+        ttk.Entry(export_window, textvariable=since).grid(row=0, column=1, sticky='ew', padx=5, pady=5)
+        ttk.Label(export_window, text="Until (YYYY-MM-DD):").grid(row=1, column=0, sticky='w', padx=5, pady=5)
+        ttk.Entry(export_window, textvariable=until).grid(row=1, column=1, sticky='ew', padx=5, pady=5)
+        ttk.Label(export_window, text="Branch/Tag Prefix:").grid(row=2, column=0, sticky='w', padx=5, pady=5)
+        ttk.Entry(export_window, textvariable=prefix).grid(row=2, column=1, sticky='ew', padx=5, pady=5)
+        ttk.Label(export_window, text="Format:").grid(row=3, column=0, sticky='w', padx=5, pady=5)
+        ttk.Combobox(export_window, textvariable=fmt, values=['jsonl', 'csv'], 
+                     state='readonly').grid(row=3, column=1, sticky='ew', padx=5, pady=5)
+        
+        def do_export():
+            path = filedialog.asksaveasfilename(parent=export_window, 
+                                                defaultextension=f".{fmt.get()}",
+                                                filetypes=[(fmt.get().upper(), f"*.{fmt.get()}")])
+            if not path:
+                return
+            try:
+                count = export_events(path, fmt.get(), since.get(), until.get(), prefix.get())
+                self.log_operation(f"Exported {count} events to {path}")
+                self.update_status(f"Exported {count} events")
+                export_window.destroy()
+            except Exception as e:
+                error_msg = str(e)
+                self.log_operation(f"Error exporting events: {error_msg}")
+                self.update_status(f"Failed to export events: {error_msg}", success=False)
+                messagebox.showerror("Error", f"Failed to export events: {error_msg}")
+        
+        ttk.Button(export_window, text="Export", command=do_export).grid(
+            row=4, column=0, columnspan=2, sticky='ew', padx=5, pady=5)
+        export_window.grid_columnconfigure(1, weight=1)
+
+    def import_event_history(self):
+        """导入事件历史"""
+        path = filedialog.askopenfilename(filetypes=[("Event files", "*.jsonl *.csv"), 
+                                                     ("All files", "*.*")])
+        if not path:
+            return
         try:
-            with open('git_events.json', 'r', encoding='utf-8') as f:
-                events_data = json.load(f)
-                
-            self.events = []
-            for event_dict in events_data:
-                event = GitEvent()
-                event.title = event_dict['title']
-                event.date = event_dict['date']
-                event.description = event_dict['description']
-                event.created_branch = event_dict['created_branch']
-                event.merged_branches = event_dict['merged_branches']
-                event.created_tag = event_dict['created_tag']
-                event.notes = event_dict['notes']
-                self.events.append(event)
-        except FileNotFoundError:
-            pass
+            count = import_events(path)
+            
+            # 重新加载事件并同步统计汇总表
+            self.load_events_from_file()
+            self.analytics.load(self.events)
+            
+            self.log_operation(f"Imported {count} events from {path}")
+            self.update_status(f"Imported {count} events")
+        except Exception as e:
+            error_msg = str(e)
+            self.log_operation(f"Error importing events: {error_msg}")
+            self.update_status(f"Failed to import events: {error_msg}", success=False)
+            messagebox.showerror("Error", f"Failed to import events: {error_msg}")
             
     def show_event_history(self):
         """显示事件历史"""
@@ -783,6 +2649,84 @@ class GitEventManager:
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+    def run_repository_maintenance(self):
+        """在后台线程中执行仓库维护，结果写入日志"""
+        if not messagebox.askyesno("Maintenance", 
+                                   "Inspect the repository and run ref packing, commit-graph, "
+                                   "repack and remote prune where needed?"):
+            return
+        
+        messages = queue.Queue()
+        remote_name = self.repo.remote().name
+        
+        # 消息格式为 (内容, 是否结束, 是否成功)
+        def worker():
+            try:
+                result = run_maintenance(git.Repo(self.repo.working_dir), remote_name, 
+                                         log=lambda message: messages.put((message, False, True)))
+                messages.put((f"Maintenance finished: {len(result['actions'])} actions", True, True))
+            except Exception as e:
+                messages.put((f"Maintenance failed: {str(e)}", True, False))
+        
+        def poll():
+            while not messages.empty():
+                message, finished, success = messages.get_nowait()
+                self.log_operation(message)
+                if finished:
+                    self.update_status(message, success=success)
+                    return
+            self.root.after(200, poll)
+        
+        self.log_operation("Starting repository maintenance")
+        threading.Thread(target=worker, name="repo-maintenance", daemon=True).start()
+        self.root.after(200, poll)
+
+    def show_git_stats(self):
+        """在日志中显示常驻 git 进程的命中和延迟统计"""
+        stats = get_cat_file_pool(self.repo).stats()
+        self.log_operation("Git object lookup statistics", format_cat_file_stats(stats))
+
+    def show_event_analytics(self):
+        """显示发布节奏统计"""
+        analytics_window = tk.Toplevel(self.root)
+        analytics_window.title("Event Analytics")
+        
+        # 汇总信息
+        average = self.analytics.average_branch_to_tag_days()
+        average_text = f"{average:.1f} days" if average is not None else "n/a"
+        ttk.Label(analytics_window, 
+                  text=f"Events: {self.analytics.event_count}    "
+                       f"Avg branch → tag: {average_text}").pack(anchor='w', padx=5, pady=5)
+        
+        notebook = ttk.Notebook(analytics_window)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # 每周新建分支数
+        week_tree = ttk.Treeview(notebook, columns=('Week', 'Branches'), show='headings')
+        week_tree.heading('Week', text='Week')
+        week_tree.heading('Branches', text='Branches Created')
+        for week, count in sorted(self.analytics.branches_per_week.items()):
+            week_tree.insert('', 'end', values=(week, count))
+        notebook.add(week_tree, text="Branches per Week")
+        
+        # 各分支合并次数
+        merge_tree = ttk.Treeview(notebook, columns=('Branch', 'Merges'), show='headings')
+        merge_tree.heading('Branch', text='Branch')
+        merge_tree.heading('Merges', text='Times Merged')
+        for branch, count in sorted(self.analytics.merge_counts.items(), 
+                                    key=lambda item: (-item[1], item[0])):
+            merge_tree.insert('', 'end', values=(branch, count))
+        notebook.add(merge_tree, text="Merge Frequency")
+        
+        # 从分支到标签的时间
+        tag_tree = ttk.Treeview(notebook, columns=('Tag', 'Branch', 'Days'), show='headings')
+        tag_tree.heading('Tag', text='Tag')
+        tag_tree.heading('Branch', text='Branch')
+        tag_tree.heading('Days', text='Days from Branch')
+        for tag, item in sorted(self.analytics.branch_to_tag.items()):
+            tag_tree.insert('', 'end', values=(tag, item['branch'], item['days']))
+        notebook.add(tag_tree, text="Branch to Tag")
+
     def setup_toolbar(self):
         toolbar = ttk.Frame(self.root)
         toolbar.pack(fill=tk.X, padx=5, pady=5)
@@ -894,6 +2838,25 @@ class GitEventManager:
         self.merge_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         merge_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # 合并预览区域
+        preview_frame = ttk.LabelFrame(merge_frame, text="Preview")
+        preview_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.merge_preview_text = tk.Text(preview_frame, height=10, wrap=tk.NONE)
+        preview_scrollbar = ttk.Scrollbar(preview_frame, orient="vertical", 
+                                          command=self.merge_preview_text.yview)
+        self.merge_preview_text.configure(yscrollcommand=preview_scrollbar.set, state='disabled')
+        self.merge_preview_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        preview_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # 合并顺序优化选项
+        ttk.Checkbutton(merge_frame, text="Optimize merge order (by changed-file overlap)", 
+                        variable=self.optimize_merge_order).pack(anchor='w', padx=5, pady=2)
+        
+        # 章鱼合并选项
+        ttk.Checkbutton(merge_frame, text="Octopus merge (one commit for non-conflicting items)", 
+                        variable=self.octopus_merge).pack(anchor='w', padx=5, pady=2)
+        
         # 合并按钮
         ttk.Button(merge_frame, text="Merge Selected", 
                    command=self.merge_branches).pack(fill=tk.X, padx=5, pady=5)
@@ -939,6 +2902,114 @@ class GitEventManager:
         ttk.Button(tag_frame, text="Create Tag", 
                    command=self.create_tag).pack(fill=tk.X, padx=5, pady=5)
 
+def main(argv=None):
+    """命令行入口，无子命令时启动图形界面"""
+    parser = argparse.ArgumentParser(description="Git Event Manager")
+    parser.add_argument('--profile', action='store_true', 
+                        help=f"Profile UI callbacks and write statistics to {PROFILE_DIR}/")
+    parser.add_argument('--daemon', metavar='ADDRESS', 
+                        help="Share name allocation with a running daemon")
+    parser.add_argument('--stall-threshold', type=int, default=500, metavar='MS', 
+                        help="Log the main thread stack when the event loop stalls longer "
+                             "than this (0 disables)")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    export_parser = subparsers.add_parser('export', help="Export event history as JSONL or CSV")
+    export_parser.add_argument('output', help="Output file ('-' for stdout)")
+    export_parser.add_argument('--format', choices=['jsonl', 'csv'])
+    export_parser.add_argument('--since', help="Earliest event date (YYYY-MM-DD)")
+    export_parser.add_argument('--until', help="Latest event date (YYYY-MM-DD)")
+    export_parser.add_argument('--prefix', help="Created branch/tag prefix")
+    
+    import_parser = subparsers.add_parser('import', help="Import event history from JSONL or CSV")
+    import_parser.add_argument('input', help="Input file")
+    import_parser.add_argument('--format', choices=['jsonl', 'csv'])
+    
+    plan_parser = subparsers.add_parser('plan', help="Execute a release plan file")
+    plan_parser.add_argument('plan', help="Release plan JSON file")
+    plan_parser.add_argument('--dry-run', action='store_true', 
+                             help="Print resolved names and expected step timings only")
+    plan_parser.add_argument('--workers', type=int, default=4)
+    
+    maintain_parser = subparsers.add_parser('maintain', help="Optimize refs and history for this tool's workloads")
+    maintain_parser.add_argument('--dry-run', action='store_true', help="Only report what would run")
+    maintain_parser.add_argument('--force', action='store_true', help="Ignore thresholds")
+    maintain_parser.add_argument('--remote', default='origin')
+    
+    daemon_parser = subparsers.add_parser('daemon', help="Serve git operations over local JSON-RPC")
+    daemon_parser.add_argument('--address', default=DAEMON_ADDRESS, 
+                               help="Unix socket path or host:port")
+    
+    rpc_parser = subparsers.add_parser('rpc', help="Call a method on a running daemon")
+    rpc_parser.add_argument('method')
+    rpc_parser.add_argument('--params', default='{}', help="JSON object of method parameters")
+    rpc_parser.add_argument('--address', default=DAEMON_ADDRESS)
+    
+    bulk_parser = subparsers.add_parser('bulk-create', 
+                                        help="Create many branches/tags in one atomic ref transaction")
+    bulk_parser.add_argument('--branch', action='append', default=[], metavar='NAME[=REV]')
+    bulk_parser.add_argument('--tag', action='append', default=[], metavar='NAME[=REV]')
+    bulk_parser.add_argument('--push', action='store_true')
+    bulk_parser.add_argument('--remote', default='origin')
+    
+    
+    args = parser.parse_args(argv)
+    
+    if args.command is None:
+        app = GitEventManager(profile=args.profile, stall_threshold_ms=args.stall_threshold, 
+                              daemon_address=args.daemon)
+        app.run()
+        return
+    
+    # 子命令出错时输出简洁的错误信息而不是堆栈
+    try:
+        run_command(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def run_command(args):
+    """执行命令行子命令"""
+    if args.command == 'export':
+        if args.output == '-':
+            event_dicts = filter_events(EventHistory(EVENTS_FILE).iter_dicts(), 
+                                        args.since, args.until, args.prefix)
+            if (args.format or 'jsonl') == 'csv':
+                write_events_csv(event_dicts, sys.stdout)
+            else:
+                write_events_jsonl(event_dicts, sys.stdout)
+        else:
+            count = export_events(args.output, args.format, args.since, args.until, args.prefix)
+            print(f"Exported {count} events to {args.output}")
+    elif args.command == 'import':
+        count = import_events(args.input, args.format)
+        print(f"Imported {count} events from {args.input}")
+    elif args.command == 'plan':
+        executor = ReleasePlanExecutor(load_release_plan(args.plan), max_workers=args.workers)
+        if args.dry_run:
+            executor.dry_run()
+        else:
+            start = time.perf_counter()
+            executor.run()
+            print(f"Release plan completed in {time.perf_counter() - start:.2f}s")
+    elif args.command == 'maintain':
+        run_maintenance(git.Repo(os.getcwd()), args.remote, force=args.force, dry_run=args.dry_run)
+    elif args.command == 'bulk-create':
+        def parse_items(values):
+            return [tuple(value.split('=', 1)) if '=' in value else (value, 'HEAD') 
+                    for value in values]
+        result = create_refs_atomically(git.Repo(os.getcwd()), parse_items(args.branch), 
+                                        parse_items(args.tag), args.remote, args.push)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif args.command == 'daemon':
+        serve_daemon(args.address)
+    elif args.command == 'rpc':
+        client = GitToolDaemonClient(args.address)
+        try:
+            result = client.call(args.method, **json.loads(args.params))
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+        finally:
+            client.close()
+
 if __name__ == "__main__":
-    app = GitEventManager()
-    app.run()            
\ No newline at end of file
+    main()            
\ No newline at end of file
@@ -0,0 +1,73 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import git
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from git_tool import create_refs_atomically
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """带有一个初始提交的本地裸仓库"""
+    remote_path = tmp_path / 'remote.git'
+    git.Repo.init(remote_path, bare=True).git.symbolic_ref('HEAD', 'refs/heads/main')
+
+    seed = git.Repo.init(tmp_path / 'seed')
+    with seed.config_writer() as config:
+        config.set_value('user', 'name', 'test')
+        config.set_value('user', 'email', 'test@localhost')
+    (tmp_path / 'seed' / 'README').write_text('test\n', encoding='utf-8')
+    seed.index.add(['README'])
+    seed.index.commit('initial')
+    seed.create_remote('origin', str(remote_path)).push('HEAD:refs/heads/main')
+    return remote_path
+
+
+def test_concurrent_creation_pushes_unique_names(remote, tmp_path):
+    workers, rounds, refs_per_round = 8, 5, 4
+
+    def worker(index):
+        clone = git.Repo.clone_from(remote, tmp_path / f"clone{index}")
+        created = []
+        for _ in range(rounds):
+            result = create_refs_atomically(
+                clone,
+                branches=[('stress', 'HEAD')] * (refs_per_round // 2),
+                tags=[('stress', 'HEAD')] * (refs_per_round - refs_per_round // 2),
+                push=True, max_attempts=50)
+            created += [f"refs/heads/{name}" for name in result['branches']]
+            created += [f"refs/tags/{name}" for name in result['tags']]
+        return created
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        created = [ref for refs in pool.map(worker, range(workers)) for ref in refs]
+
+    remote_refs = git.Repo(remote).git.for_each_ref('--format=%(refname)').splitlines()
+    assert len(created) == workers * rounds * refs_per_round
+    assert len(set(created)) == len(created)
+    assert set(created) <= set(remote_refs)
+
+
+def test_existing_names_get_suffix(remote, tmp_path):
+    clone = git.Repo.clone_from(remote, tmp_path / 'clone')
+    first = create_refs_atomically(clone, branches=[('rel', 'HEAD')], tags=[('v1', 'HEAD')])
+    second = create_refs_atomically(clone, branches=[('rel', 'HEAD')], tags=[('v1', 'HEAD')])
+    assert first['branches'] != second['branches']
+    assert first['tags'] != second['tags']
+
+
+def test_invalid_name_is_rejected(remote, tmp_path):
+    clone = git.Repo.clone_from(remote, tmp_path / 'clone')
+    with pytest.raises(ValueError):
+        create_refs_atomically(clone, branches=[('bad name~', 'HEAD')])
+
+
+def test_directory_file_clash_is_not_retried(remote, tmp_path):
+    clone = git.Repo.clone_from(remote, tmp_path / 'clone')
+    clone.git.branch('rel')
+    with pytest.raises(git.GitCommandError):
+        create_refs_atomically(clone, branches=[('rel/x', 'HEAD')])